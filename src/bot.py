@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
 import signal
 import sys
 import time
-from typing import Optional
+from typing import Optional, Set
 
 import discord
 from discord import app_commands
@@ -15,7 +17,7 @@ from discord.ext import commands
 
 from .cogs.core import CoreCog
 from .cogs.ora import ORACog
-from .config import Config, ConfigError
+from .config import Config, ConfigError, get_config
 from .logging_conf import setup_logging
 from .storage import Store
 from .utils.link_client import LinkClient
@@ -39,6 +41,13 @@ class ORABot(commands.Bot):
             command_prefix=commands.when_mentioned_or("!"),
             intents=intents,
             application_id=config.app_id,
+            help_command=None,
+            # Slash commands carry everything we need; skip member/message caching.
+            # VoiceManager needs voice_states/members intents and a voice member cache
+            # before it can be wired in; see its docstring.
+            chunk_guilds_at_startup=False,
+            max_messages=None,
+            member_cache_flags=discord.MemberCacheFlags.none(),
         )
         self.config = config
         self.link_client = link_client
@@ -59,19 +68,76 @@ class ORABot(commands.Bot):
             )
         )
         self.tree.on_error = self.on_app_command_error
-        await self._sync_commands()
+        await self._check_command_tree()
 
-    async def _sync_commands(self) -> None:
-        if self.config.dev_guild_id:
-            guild = discord.Object(id=self.config.dev_guild_id)
+    def _command_tree_hash(self) -> str:
+        payload = [cmd.to_dict(self.tree) for cmd in self.tree.get_commands()]
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    @staticmethod
+    def _command_hash_key(guild_id: Optional[int]) -> str:
+        return f"command_tree_hash:{guild_id}" if guild_id else "command_tree_hash"
+
+    async def _check_command_tree(self) -> None:
+        """Warn when the local command tree differs from the last synchronised one."""
+
+        hash_key = self._command_hash_key(self.config.dev_guild_id)
+        if await self.store.get_kv(hash_key) != self._command_tree_hash():
+            logger.warning(
+                "Application commands changed since the last sync. DM the bot the "
+                "owner-only sync command (!sync) to publish them."
+            )
+
+    async def sync_commands(self, guild_id: Optional[int] = None) -> int:
+        """Synchronise application commands and return the number of synced commands.
+
+        ``guild_id`` defaults to ``ORA_DEV_GUILD_ID``; without either, commands are
+        synchronised globally.
+        """
+
+        guild_id = guild_id or self.config.dev_guild_id
+        target = str(guild_id) if guild_id else "global"
+        previous = await self.store.get_kv("command_sync_target")
+        if previous and previous != target:
+            await self._clear_remote_commands(previous)
+
+        digest = self._command_tree_hash()
+        if guild_id:
+            guild = discord.Object(id=guild_id)
             self.tree.copy_global_to(guild=guild)
             synced = await self.tree.sync(guild=guild)
-            logger.info(
-                "Synchronized %d commands to guild %s", len(synced), self.config.dev_guild_id
-            )
+            logger.info("Synchronized %d commands to guild %s", len(synced), guild_id)
         else:
             synced = await self.tree.sync()
             logger.info("Synchronized %d commands globally", len(synced))
+        await self.store.set_kv(self._command_hash_key(guild_id), digest)
+        await self.store.set_kv("command_sync_target", target)
+        return len(synced)
+
+    async def _clear_remote_commands(self, target: str) -> None:
+        """Remove commands left on Discord by a sync to another target.
+
+        Without this, switching between guild and global sync lists every command
+        twice in the dev guild until Discord's global cache expires.
+        """
+
+        if target == "global":
+            global_commands = self.tree.get_commands()
+            self.tree.clear_commands(guild=None)
+            try:
+                await self.tree.sync()
+            finally:
+                for command in global_commands:
+                    self.tree.add_command(command)
+            logger.info("Cleared previously synchronized global commands")
+            await self.store.delete_kv(self._command_hash_key(None))
+        else:
+            guild = discord.Object(id=int(target))
+            self.tree.clear_commands(guild=guild)
+            await self.tree.sync(guild=guild)
+            logger.info("Cleared previously synchronized commands in guild %s", target)
+            await self.store.delete_kv(self._command_hash_key(guild.id))
 
     async def on_ready(self) -> None:
         assert self.user is not None
@@ -95,6 +161,14 @@ class ORABot(commands.Bot):
     async def on_error(self, event_method: str, *args: object, **kwargs: object) -> None:
         logger.exception("Unhandled error in event %s", event_method)
 
+    async def on_command_error(
+        self, context: commands.Context[commands.Bot], exception: commands.CommandError
+    ) -> None:
+        if isinstance(exception, (commands.CommandNotFound, commands.NotOwner)):
+            logger.debug("Ignored prefix command error: %s", exception)
+            return
+        await super().on_command_error(context, exception)
+
     async def on_app_command_error(
         self, interaction: discord.Interaction, error: app_commands.AppCommandError
     ) -> None:
@@ -115,11 +189,23 @@ class ORABot(commands.Bot):
             await interaction.response.send_message(message, ephemeral=True)
 
 
-def _configure_signals(stop_event: asyncio.Event) -> None:
+_shutdown_tasks: Set[asyncio.Task[None]] = set()
+
+
+def _configure_signals(bot: ORABot) -> None:
     loop = asyncio.get_running_loop()
+
+    def _shutdown() -> None:
+        if bot.is_closed():
+            return
+        logger.info("Shutdown signal received. Closing bot...")
+        task = loop.create_task(bot.close())
+        _shutdown_tasks.add(task)
+        task.add_done_callback(_shutdown_tasks.discard)
+
     for sig in (signal.SIGTERM, signal.SIGINT):
         try:
-            loop.add_signal_handler(sig, stop_event.set)
+            loop.add_signal_handler(sig, _shutdown)
         except NotImplementedError:
             logger.warning("Signal handlers are not supported on this platform.")
             break
@@ -127,7 +213,7 @@ def _configure_signals(stop_event: asyncio.Event) -> None:
 
 async def run_bot() -> None:
     try:
-        config = Config.load()
+        config = get_config()
     except ConfigError as exc:
         print(exc, file=sys.stderr)
         raise SystemExit(1) from exc
@@ -135,8 +221,8 @@ async def run_bot() -> None:
     setup_logging(config.log_level)
     logger.info("Starting ORA Discord bot", extra={"app_id": config.app_id})
 
-    intents = discord.Intents.none()
-    intents.guilds = True
+    # DM message events are only needed for the owner-only prefix commands (e.g. sync).
+    intents = discord.Intents(guilds=True, dm_messages=True)
 
     link_client = LinkClient(config.ora_api_base_url)
     llm_client = LLMClient(config.llm_base_url, config.llm_api_key, config.llm_model)
@@ -151,35 +237,18 @@ async def run_bot() -> None:
         intents=intents,
     )
 
-    stop_event = asyncio.Event()
-    _configure_signals(stop_event)
-
-    async with bot:
-        bot_task = asyncio.create_task(bot.start(config.token))
-        stop_task = asyncio.create_task(stop_event.wait())
-
-        done, pending = await asyncio.wait(
-            {bot_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
-        )
-
-        if stop_task in done:
-            logger.info("Shutdown signal received. Closing bot...")
-            await bot.close()
+    _configure_signals(bot)
 
-        if bot_task in done:
-            exc: Optional[BaseException] = bot_task.exception()
-            if exc:
+    try:
+        async with bot:
+            try:
+                await bot.start(config.token)
+            except Exception:
                 logger.exception("Bot stopped due to an error.")
-                raise exc
-        else:
-            await bot.close()
-            await bot_task
-
-        for task in pending:
-            task.cancel()
-
-        if pending:
-            await asyncio.gather(*pending, return_exceptions=True)
+                raise
+    finally:
+        await llm_client.aclose()
+        await store.aclose()
 
 
 def main() -> None:
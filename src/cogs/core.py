@@ -4,14 +4,8 @@ from __future__ import annotations
 
 import logging
 import os
-import platform
 import time
-
-try:
-    import resource  # type: ignore
-except ImportError:  # pragma: no cover - platform specific
-    resource = None  # type: ignore
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 import discord
 from discord import app_commands
@@ -28,14 +22,27 @@ class CoreCog(commands.Cog):
     def __init__(self, bot: commands.Bot, link_client: LinkClient) -> None:
         self.bot = bot
         self._link_client = link_client
+        self._log = logger
+        self._static_health: Optional[Tuple[str, str]] = None
+        self._latency_cache: Tuple[float, str] = (0.0, "")
+
+    def _latency_text(self) -> str:
+        """Return the websocket latency in whole milliseconds, refreshed at most every 100 ms."""
+
+        now = time.monotonic()
+        checked_at, text = self._latency_cache
+        if text and now - checked_at < 0.1:
+            return text
+        text = f"{self.bot.latency * 1000:.0f}"
+        self._latency_cache = (now, text)
+        return text
 
     @app_commands.command(name="ping", description="Botのレイテンシを確認します。")
     async def ping(self, interaction: discord.Interaction) -> None:
         """Return the websocket latency."""
 
-        latency_ms = self.bot.latency * 1000
         await interaction.response.send_message(
-            f"Pong! {latency_ms:.0f}ms", ephemeral=True
+            f"Pong! {self._latency_text()}ms", ephemeral=True
         )
 
     @app_commands.command(name="say", description="指定したメッセージを送信します。")
@@ -55,7 +62,9 @@ class CoreCog(commands.Cog):
             return
 
         if not interaction.user.guild_permissions.administrator:
-            raise app_commands.CheckFailure("管理者権限が必要です。")
+            self._log.info("Command check failed: say by %s", interaction.user.id)
+            await interaction.response.send_message("管理者権限が必要です。", ephemeral=True)
+            return
 
         await interaction.response.send_message(text, ephemeral=ephemeral)
 
@@ -68,7 +77,7 @@ class CoreCog(commands.Cog):
         try:
             code = await self._link_client.request_link_code(user_id)
         except Exception:  # noqa: BLE001 - send friendly message while logging separately
-            logger.exception("Failed to generate link code", extra={"user_id": user_id})
+            self._log.exception("Failed to generate link code", extra={"user_id": user_id})
             await interaction.followup.send(
                 "リンクコードの生成に失敗しました。時間を置いて再度お試しください。",
                 ephemeral=True,
@@ -82,11 +91,16 @@ class CoreCog(commands.Cog):
         """Return runtime information about the bot process."""
 
         uptime_seconds = time.time() - getattr(self.bot, "started_at", time.time())
-        latency_ms = self.bot.latency * 1000
         guild_count = len(self.bot.guilds)
         pid = os.getpid()
         process_memory: Optional[str] = None
 
+        # Imported lazily: /health is rare and these modules are not needed at startup.
+        try:
+            import resource
+        except ImportError:  # pragma: no cover - platform specific
+            resource = None  # type: ignore[assignment]
+
         if resource is not None:
             try:
                 usage = resource.getrusage(resource.RUSAGE_SELF)
@@ -98,23 +112,36 @@ class CoreCog(commands.Cog):
         lines = [
             f"PID: {pid}",
             f"Uptime: {uptime_seconds:.0f} 秒",
-            f"Latency: {latency_ms:.0f} ms",
+            f"Latency: {self._latency_text()} ms",
             f"Guilds: {guild_count}",
-            f"Python: {platform.python_version()}",
-            f"discord.py: {discord.__version__}",
         ]
+        if self._static_health is None:
+            import platform
+
+            self._static_health = (
+                f"Python: {platform.python_version()}",
+                f"discord.py: {discord.__version__}",
+            )
+        lines.extend(self._static_health)
         if process_memory:
             lines.append(f"Memory: {process_memory}")
 
         await interaction.response.send_message("\n".join(lines), ephemeral=True)
 
+    @commands.command(name="sync")
+    @commands.is_owner()
+    async def sync(
+        self, ctx: commands.Context[commands.Bot], guild_id: Optional[int] = None
+    ) -> None:
+        """Synchronise application commands with Discord (owner only)."""
+
+        count = await self.bot.sync_commands(guild_id)  # type: ignore[attr-defined]
+        await ctx.send(f"{count} 件のコマンドを同期しました。")
+
     @commands.Cog.listener()
     async def on_app_command_completion(
         self, interaction: discord.Interaction, command: app_commands.Command[Any, Any, Any]
     ) -> None:
-        logger.info(
-            "Command %s executed by %s (%s)",
-            command.qualified_name,
-            interaction.user,
-            getattr(interaction.user, "id", "unknown"),
-        )
+        if not self._log.isEnabledFor(logging.INFO):
+            return
+        self._log.info("Command %s executed by %s", command.qualified_name, interaction.user.id)
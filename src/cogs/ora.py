@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import secrets
-import string
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Optional, Set, Tuple
 
 import aiohttp
 import discord
@@ -18,10 +20,21 @@ from ..utils.llm_client import LLMClient
 
 logger = logging.getLogger(__name__)
 
+# Privacy lookups are cached per user to avoid two SQLite round-trips per command.
+_PRIVACY_CACHE_TTL = 60.0
+_PRIVACY_CACHE_SIZE = 10_000
 
-def _nonce(length: int = 32) -> str:
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+# Users whose row is known to exist; reset when it grows past this size.
+_ENSURED_USERS_MAX = 100_000
+
+# Largest attachment forwarded to the ORA API; bigger files are kept as metadata only.
+_DATASET_MAX_BYTES = 100 * 1024 * 1024
+_DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+def _nonce(nbytes: int = 24) -> str:
+    # 24 random bytes encode to 32 URL-safe characters.
+    return secrets.token_urlsafe(nbytes)
 
 
 class ORACog(commands.Cog):
@@ -41,15 +54,85 @@ class ORACog(commands.Cog):
         self._llm = llm
         self._public_base_url = public_base_url
         self._ora_api_base_url = ora_api_base_url
+        self._ingest_url = (
+            f"{ora_api_base_url}/api/datasets/ingest" if ora_api_base_url else None
+        )
+        self._ingest_from_url_url = (
+            f"{ora_api_base_url}/api/datasets/ingest_url" if ora_api_base_url else None
+        )
+        # Tri-state: None until the ORA API has told us whether it can fetch URLs itself.
+        self._ingest_by_url_supported: Optional[bool] = None
         self._privacy_default = privacy_default
+        self._log = logger
+        self._privacy_cache: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+        self._ensured_users: Set[int] = set()
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    async def cog_load(self) -> None:
+        self._http = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=120),
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            read_bufsize=64 * 1024,
+        )
+
+    async def cog_unload(self) -> None:
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    def _mark_ensured(self, user_id: int) -> None:
+        if len(self._ensured_users) >= _ENSURED_USERS_MAX:
+            self._ensured_users.clear()
+        self._ensured_users.add(user_id)
+
+    async def _ensure_user(self, user_id: int) -> None:
+        if user_id in self._ensured_users:
+            return
+        _, privacy = await self._store.ensure_user(user_id, self._privacy_default)
+        self._mark_ensured(user_id)
+        self._cache_privacy(user_id, privacy)
+
+    def _cache_privacy(self, user_id: int, privacy: str) -> None:
+        self._privacy_cache[user_id] = (privacy, time.monotonic() + _PRIVACY_CACHE_TTL)
+        self._privacy_cache.move_to_end(user_id)
+        while len(self._privacy_cache) > _PRIVACY_CACHE_SIZE:
+            self._privacy_cache.popitem(last=False)
+
+    def _cached_privacy(self, user_id: int) -> Optional[str]:
+        cached = self._privacy_cache.get(user_id)
+        if cached is None or cached[1] <= time.monotonic():
+            return None
+        self._privacy_cache.move_to_end(user_id)
+        return cached[0]
+
+    def _ephemeral_fast(self, user: User) -> Optional[bool]:
+        """Resolve ephemerality from the cache without awaiting; ``None`` on a miss."""
+
+        privacy = self._cached_privacy(user.id)
+        return None if privacy is None else privacy == "private"
+
+    async def _privacy_for(self, user: User) -> str:
+        """Return the user's privacy mode, registering the user on a cache miss."""
+
+        privacy = self._cached_privacy(user.id)
+        if privacy is not None:
+            return privacy
+
+        if user.id in self._ensured_users:
+            # The row already exists, so a plain read refreshes it without a write.
+            privacy = await self._store.get_privacy(user.id)
+        else:
+            _, privacy = await self._store.ensure_user(user.id, self._privacy_default)
+            self._mark_ensured(user.id)
+        self._cache_privacy(user.id, privacy)
+        return privacy
 
     async def _ephemeral_for(self, user: User) -> bool:
-        privacy = await self._store.get_privacy(user.id)
-        return privacy == "private"
+        return await self._privacy_for(user) == "private"
 
     @app_commands.command(name="login", description="Googleアカウント連携用のURLを発行します。")
     async def login(self, interaction: discord.Interaction) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
+        await self._ensure_user(interaction.user.id)
         if not self._public_base_url:
             await interaction.response.send_message(
                 "PUBLIC_BASE_URL が未設定のためログインURLを発行できません。",
@@ -57,26 +140,29 @@ class ORACog(commands.Cog):
             )
             return
 
-        await interaction.response.defer(ephemeral=True, thinking=True)
+        # Only a local SQLite write happens here, so answer directly instead of
+        # paying for defer + followup round-trips.
         state = _nonce()
         await self._store.start_login_state(state, interaction.user.id, ttl_sec=900)
         url = f"{self._public_base_url}/auth/discord?state={state}"
-        await interaction.followup.send(
+        await interaction.response.send_message(
             "Google ログインの準備ができました。以下のURLから認証を完了してください。\n" + url,
             ephemeral=True,
         )
 
     @app_commands.command(name="whoami", description="連携済みアカウント情報を表示します。")
     async def whoami(self, interaction: discord.Interaction) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
-        google_sub = await self._store.get_google_sub(interaction.user.id)
-        privacy = await self._store.get_privacy(interaction.user.id)
-        lines = [
-            f"Discord: {interaction.user} (ID: {interaction.user.id})",
-            f"Google: {'連携済み' if google_sub else '未連携'}",
+        google_sub, privacy = await self._store.ensure_user(
+            interaction.user.id, self._privacy_default
+        )
+        self._mark_ensured(interaction.user.id)
+        self._cache_privacy(interaction.user.id, privacy)
+        await interaction.response.send_message(
+            f"Discord: {interaction.user} (ID: {interaction.user.id})\n"
+            f"Google: {'連携済み' if google_sub else '未連携'}\n"
             f"既定の公開範囲: {privacy}",
-        ]
-        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+            ephemeral=True,
+        )
 
     privacy_group = app_commands.Group(
         name="privacy", description="返信の既定公開範囲を設定します"
@@ -93,8 +179,9 @@ class ORACog(commands.Cog):
     async def privacy_set(
         self, interaction: discord.Interaction, mode: app_commands.Choice[str]
     ) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
         await self._store.set_privacy(interaction.user.id, mode.value)
+        self._mark_ensured(interaction.user.id)
+        self._cache_privacy(interaction.user.id, mode.value)
         await interaction.response.send_message(
             f"既定公開範囲を {mode.value} に更新しました。", ephemeral=True
         )
@@ -102,8 +189,9 @@ class ORACog(commands.Cog):
     @app_commands.command(name="chat", description="LM Studio 経由で応答を生成します。")
     @app_commands.describe(prompt="送信する内容")
     async def chat(self, interaction: discord.Interaction, prompt: str) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
-        ephemeral = await self._ephemeral_for(interaction.user)
+        ephemeral = self._ephemeral_fast(interaction.user)
+        if ephemeral is None:
+            ephemeral = await self._ephemeral_for(interaction.user)
         await interaction.response.defer(ephemeral=ephemeral, thinking=True)
         try:
             content = await self._llm.chat(
@@ -111,13 +199,84 @@ class ORACog(commands.Cog):
                 temperature=0.7,
             )
         except Exception:
-            logger.exception("LLM call failed", extra={"user_id": interaction.user.id})
+            self._log.exception("LLM call failed", extra={"user_id": interaction.user.id})
             await interaction.followup.send("LLM 呼び出しに失敗しました。", ephemeral=True)
             return
         await interaction.followup.send(content, ephemeral=ephemeral)
 
     dataset_group = app_commands.Group(name="dataset", description="データセット管理コマンド")
 
+    async def _upload_dataset(
+        self, user_id: int, title: str, file: discord.Attachment
+    ) -> bool:
+        """Forward the attachment to the ORA API; return whether it was accepted."""
+
+        if self._ingest_url is None or self._http is None:
+            return False
+
+        session = self._http
+        try:
+            if self._ingest_by_url_supported is not False:
+                if await self._ingest_by_url(session, user_id, title, file):
+                    return True
+
+            if file.size > _DATASET_MAX_BYTES:
+                self._log.warning(
+                    "Attachment too large to forward",
+                    extra={"user_id": user_id, "size": file.size},
+                )
+                return False
+
+            async with session.get(file.url) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"Failed to download attachment: {resp.status}")
+                if (resp.content_length or 0) > _DATASET_MAX_BYTES:
+                    raise RuntimeError(f"Attachment too large: {resp.content_length} bytes")
+                form = aiohttp.FormData()
+                form.add_field("discord_user_id", str(user_id))
+                form.add_field("dataset_name", title)
+                # Pipe the CDN body straight into the upload instead of buffering it.
+                form.add_field(
+                    "file",
+                    resp.content,
+                    filename=file.filename,
+                    content_type=file.content_type or _DEFAULT_CONTENT_TYPE,
+                )
+                async with session.post(self._ingest_url, data=form) as response:
+                    if response.status != 200:
+                        body = await response.text()
+                        raise RuntimeError(
+                            f"Dataset upload failed with status {response.status}: {body}"
+                        )
+        except Exception:
+            self._log.exception("Dataset upload failed", extra={"user_id": user_id})
+            return False
+        return True
+
+    async def _ingest_by_url(
+        self,
+        session: aiohttp.ClientSession,
+        user_id: int,
+        title: str,
+        file: discord.Attachment,
+    ) -> bool:
+        """Ask the ORA API to pull the attachment itself; ``False`` if unsupported."""
+
+        assert self._ingest_from_url_url is not None
+        payload = {"discord_user_id": str(user_id), "dataset_name": title, "url": file.url}
+        async with session.post(self._ingest_from_url_url, json=payload) as response:
+            if response.status in (404, 405, 501):
+                self._log.info("ORA API has no URL ingest endpoint; streaming uploads instead")
+                self._ingest_by_url_supported = False
+                return False
+            if response.status != 200:
+                body = await response.text()
+                raise RuntimeError(
+                    f"Dataset URL ingest failed with status {response.status}: {body}"
+                )
+        self._ingest_by_url_supported = True
+        return True
+
     @dataset_group.command(name="add", description="添付ファイルをデータセットとして登録します。")
     @app_commands.describe(
         file="取り込む添付ファイル",
@@ -129,42 +288,19 @@ class ORACog(commands.Cog):
         file: discord.Attachment,
         name: Optional[str] = None,
     ) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
-        ephemeral = await self._ephemeral_for(interaction.user)
+        ephemeral = self._ephemeral_fast(interaction.user)
+        if ephemeral is None:
+            ephemeral = await self._ephemeral_for(interaction.user)
         await interaction.response.defer(ephemeral=ephemeral, thinking=True)
 
         title = name or file.filename
-        dataset_id = await self._store.add_dataset(interaction.user.id, title, file.url)
-
-        uploaded = False
-        if self._ora_api_base_url:
-            try:
-                timeout = aiohttp.ClientTimeout(total=120)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(file.url) as resp:
-                        if resp.status != 200:
-                            raise RuntimeError(f"Failed to download attachment: {resp.status}")
-                        data = await resp.read()
-                    upload_url = f"{self._ora_api_base_url}/api/datasets/ingest"
-                    form = aiohttp.FormData()
-                    form.add_field("discord_user_id", str(interaction.user.id))
-                    form.add_field("dataset_name", title)
-                    form.add_field(
-                        "file",
-                        data,
-                        filename=file.filename,
-                        content_type=file.content_type or "application/octet-stream",
-                    )
-                    async with session.post(upload_url, data=form) as response:
-                        if response.status == 200:
-                            uploaded = True
-                        else:
-                            body = await response.text()
-                            raise RuntimeError(
-                                f"Dataset upload failed with status {response.status}: {body}"
-                            )
-            except Exception:
-                logger.exception("Dataset upload failed", extra={"user_id": interaction.user.id})
+        async with asyncio.TaskGroup() as tg:
+            insert = tg.create_task(
+                self._store.add_dataset(interaction.user.id, title, file.url)
+            )
+            upload = tg.create_task(self._upload_dataset(interaction.user.id, title, file))
+        dataset_id = insert.result()
+        uploaded = upload.result()
 
         msg = (
             f"データセット『{title}』を登録しました (ID: {dataset_id}) "
@@ -174,16 +310,20 @@ class ORACog(commands.Cog):
 
     @dataset_group.command(name="list", description="登録済みデータセットを表示します。")
     async def dataset_list(self, interaction: discord.Interaction) -> None:
-        await self._store.ensure_user(interaction.user.id, self._privacy_default)
-        ephemeral = await self._ephemeral_for(interaction.user)
-        datasets = await self._store.list_datasets(interaction.user.id, limit=10)
+        privacy, datasets = await self._store.list_datasets_with_privacy(
+            interaction.user.id, limit=10
+        )
+        if privacy is not None:
+            self._mark_ensured(interaction.user.id)
+            self._cache_privacy(interaction.user.id, privacy)
+        ephemeral = (privacy or self._privacy_default) == "private"
         if not datasets:
             await interaction.response.send_message(
                 "登録済みのデータセットはありません。", ephemeral=ephemeral
             )
             return
 
-        lines = [
+        message = "\n".join(
             f"{dataset_id}: {name} {url or ''}" for dataset_id, name, url, _ in datasets
-        ]
-        await interaction.response.send_message("\n".join(lines), ephemeral=ephemeral)
+        )
+        await interaction.response.send_message(message, ephemeral=ephemeral)
@@ -5,9 +5,14 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
+_LEVEL_NAMES = frozenset(logging.getLevelNamesMapping())
+_LOG_LEVEL_DEFAULT = "INFO"
+
+
 class ConfigError(RuntimeError):
     """Raised when configuration is invalid."""
 
@@ -60,15 +65,15 @@ class Config:
             except ValueError as exc:  # pragma: no cover - validation only
                 raise ConfigError("ORA_DEV_GUILD_ID は数値で指定してください。") from exc
 
-        log_level_raw = os.getenv("LOG_LEVEL", "INFO").strip()
+        log_level_raw = os.getenv("LOG_LEVEL", _LOG_LEVEL_DEFAULT).strip()
         if log_level_raw.isdigit():
             level_name = logging.getLevelName(int(log_level_raw))
-            if not isinstance(level_name, str) or level_name not in logging.getLevelNamesMapping():
+            if not isinstance(level_name, str) or level_name not in _LEVEL_NAMES:
                 raise ConfigError("LOG_LEVEL に不明な値が指定されています。")
             log_level = level_name
         else:
             log_level = log_level_raw.upper()
-            if log_level not in logging.getLevelNamesMapping():
+            if log_level not in _LEVEL_NAMES:
                 raise ConfigError("LOG_LEVEL に不明な値が指定されています。")
 
         db_path = os.getenv("ORA_BOT_DB", "ora_bot.db")
@@ -94,3 +99,10 @@ class Config:
             llm_model=llm_model,
             privacy_default=privacy_default,
         )
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the process-wide configuration, loading it on first use."""
+
+    return Config.load()
@@ -2,159 +2,403 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Sequence, Tuple
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
 
 import aiosqlite
 
+logger = logging.getLogger(__name__)
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS users (
-  discord_user_id TEXT PRIMARY KEY,
+  discord_user_id INTEGER PRIMARY KEY,
   google_sub TEXT,
   privacy TEXT NOT NULL DEFAULT 'private',
   created_at INTEGER NOT NULL
 );
 CREATE TABLE IF NOT EXISTS login_states (
   state TEXT PRIMARY KEY,
-  discord_user_id TEXT NOT NULL,
+  discord_user_id INTEGER NOT NULL,
   expires_at INTEGER NOT NULL
-);
+) WITHOUT ROWID;
 CREATE TABLE IF NOT EXISTS datasets (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
-  discord_user_id TEXT NOT NULL,
+  discord_user_id INTEGER NOT NULL,
+  name TEXT NOT NULL,
+  source_url TEXT,
+  created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_datasets_user_id ON datasets(discord_user_id, id DESC);
+CREATE TABLE IF NOT EXISTS kv (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+# Bumped whenever MIGRATIONS gains an entry; stored in ``PRAGMA user_version``.
+SCHEMA_VERSION = 2
+
+# Scripts upgrading a database from ``version - 1`` to ``version``.
+MIGRATIONS = {
+    # discord_user_id columns move from TEXT to INTEGER.
+    1: """
+CREATE TABLE users_new (
+  discord_user_id INTEGER PRIMARY KEY,
+  google_sub TEXT,
+  privacy TEXT NOT NULL DEFAULT 'private',
+  created_at INTEGER NOT NULL
+);
+INSERT INTO users_new SELECT CAST(discord_user_id AS INTEGER), google_sub, privacy, created_at
+  FROM users;
+DROP TABLE users;
+ALTER TABLE users_new RENAME TO users;
+CREATE TABLE login_states_new (
+  state TEXT PRIMARY KEY,
+  discord_user_id INTEGER NOT NULL,
+  expires_at INTEGER NOT NULL
+);
+INSERT INTO login_states_new SELECT state, CAST(discord_user_id AS INTEGER), expires_at
+  FROM login_states;
+DROP TABLE login_states;
+ALTER TABLE login_states_new RENAME TO login_states;
+CREATE TABLE datasets_new (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  discord_user_id INTEGER NOT NULL,
   name TEXT NOT NULL,
   source_url TEXT,
   created_at INTEGER NOT NULL
 );
+INSERT INTO datasets_new SELECT id, CAST(discord_user_id AS INTEGER), name, source_url, created_at
+  FROM datasets;
+DROP TABLE datasets;
+ALTER TABLE datasets_new RENAME TO datasets;
+""",
+    # login_states is keyed by its text state, so it is stored WITHOUT ROWID.
+    2: """
+CREATE TABLE login_states_new (
+  state TEXT PRIMARY KEY,
+  discord_user_id INTEGER NOT NULL,
+  expires_at INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT INTO login_states_new SELECT state, discord_user_id, expires_at FROM login_states;
+DROP TABLE login_states;
+ALTER TABLE login_states_new RENAME TO login_states;
+""",
+}
+
+# (google_sub, privacy) for a user row.
+UserRow = Tuple[Optional[str], str]
+
+# (rows returned by the statement, cursor.lastrowid) for a queued write.
+WriteResult = Tuple[List[Tuple[Any, ...]], Optional[int]]
+_PendingWrite = Tuple[str, Sequence[Any], "asyncio.Future[WriteResult]"]
+
+# Applied once to the long-lived connection opened by ``Store.init``.
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=67108864;
 """
 
+# Upper bound on writes committed together by the background writer.
+WRITE_BATCH_MAX = 64
+
+# Interval between ``PRAGMA optimize`` runs on the open connection.
+OPTIMIZE_INTERVAL_SEC = 15 * 60
+
 
 class Store:
     """Async wrapper around the SQLite database."""
 
     def __init__(self, db_path: str) -> None:
         self._db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self._optimize_task: Optional[asyncio.Task[None]] = None
+        self._writes: asyncio.Queue[_PendingWrite] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task[None]] = None
 
     async def init(self) -> None:
-        """Initialise tables if they do not exist."""
+        """Open the shared connection and initialise tables if they do not exist."""
 
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.executescript(SCHEMA)
-            await db.commit()
+        self._db = await aiosqlite.connect(self._db_path)
+        await self._db.executescript(CONNECTION_PRAGMAS)
+        await self._migrate(self._db)
+        await self._db.executescript(SCHEMA)
+        await self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        await self._db.commit()
+        self._writer_task = asyncio.create_task(self._writer_loop(), name="store-writer")
+        self._optimize_task = asyncio.create_task(self._optimize_loop(), name="store-optimize")
 
-    async def ensure_user(self, discord_user_id: int, privacy_default: str) -> None:
-        """Ensure the user row exists with a default privacy setting."""
+    @staticmethod
+    async def _migrate(db: aiosqlite.Connection) -> None:
+        """Apply pending MIGRATIONS to a database created by an older release."""
 
-        now = int(time.time())
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                (
-                    "INSERT INTO users(discord_user_id, privacy, created_at) "
-                    "VALUES(?, ?, ?) ON CONFLICT(discord_user_id) DO NOTHING"
-                ),
-                (str(discord_user_id), privacy_default, now),
+        async with db.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        version = int(row[0]) if row else 0
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='users'"
+        ) as cursor:
+            if await cursor.fetchone() is None:
+                return  # fresh database: SCHEMA creates the current layout
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            logger.info("Migrating database schema", extra={"version": target})
+            await db.executescript(
+                f"BEGIN;\n{MIGRATIONS[target]}\nPRAGMA user_version={target};\nCOMMIT;"
             )
-            await db.commit()
+
+    async def aclose(self) -> None:
+        """Flush queued writes, stop background tasks and close the shared connection."""
+
+        if self._writer_task is not None:
+            if not self._writer_task.done():
+                await self._writes.join()
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+        if self._optimize_task is not None:
+            self._optimize_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._optimize_task
+            self._optimize_task = None
+        if self._db is None:
+            return
+        async with self._lock:
+            try:
+                await self._db.execute("PRAGMA optimize")
+            except aiosqlite.Error:
+                logger.exception("PRAGMA optimize failed on close")
+            await self._db.close()
+            self._db = None
+
+    async def _optimize_loop(self) -> None:
+        while True:
+            await asyncio.sleep(OPTIMIZE_INTERVAL_SEC)
+            try:
+                async with self._connection() as db:
+                    await db.execute("PRAGMA optimize")
+            except aiosqlite.Error:
+                logger.exception("PRAGMA optimize failed")
+
+    async def _writer_loop(self) -> None:
+        """Commit queued writes in batches so bursts share a single fsync.
+
+        Whatever accumulated while the previous batch was committing is drained
+        without waiting, so an isolated write is never delayed.
+        """
+
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < WRITE_BATCH_MAX and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                await self._commit_batch(batch)
+            except Exception as exc:  # noqa: BLE001 - keep the writer alive
+                logger.exception("Store writer failed to apply a batch")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+
+    async def _commit_batch(self, batch: List[_PendingWrite]) -> None:
+        outcomes: List[Tuple["asyncio.Future[WriteResult]", Any]] = []
+        async with self._connection() as db:
+            for sql, params, future in batch:
+                try:
+                    async with db.execute(sql, params) as cursor:
+                        rows = [tuple(r) for r in await cursor.fetchall()]
+                        outcomes.append((future, (rows, cursor.lastrowid)))
+                except Exception as exc:  # noqa: BLE001 - surfaced to the caller
+                    outcomes.append((future, exc))
+            try:
+                await db.commit()
+            except aiosqlite.Error as exc:
+                logger.exception("Store write batch failed to commit")
+                await db.rollback()
+                outcomes = [(future, exc) for future, _ in outcomes]
+        for future, outcome in outcomes:
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _write(self, sql: str, params: Sequence[Any]) -> WriteResult:
+        """Queue a write for the background writer and wait for its commit."""
+
+        if self._writer_task is None:
+            raise RuntimeError("Store.init() has not been called")
+        future: asyncio.Future[WriteResult] = asyncio.get_running_loop().create_future()
+        await self._writes.put((sql, params, future))
+        return await future
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yield the shared connection, serialising statements and their commits."""
+
+        if self._db is None:
+            raise RuntimeError("Store.init() has not been called")
+        async with self._lock:
+            yield self._db
+
+    async def ensure_user(self, discord_user_id: int, privacy_default: str) -> UserRow:
+        """Ensure the user row exists and return its ``(google_sub, privacy)``.
+
+        A single upsert with ``RETURNING`` both creates missing rows and reads existing
+        ones, so callers never need a follow-up SELECT (requires SQLite 3.35+).
+        """
+
+        rows, _ = await self._write(
+            (
+                "INSERT INTO users(discord_user_id, privacy, created_at) VALUES(?, ?, ?) "
+                "ON CONFLICT(discord_user_id) DO UPDATE SET privacy=users.privacy "
+                "RETURNING google_sub, privacy"
+            ),
+            (discord_user_id, privacy_default, int(time.time())),
+        )
+        row = rows[0]
+        return (row[0] or None, str(row[1]))
 
     async def set_privacy(self, discord_user_id: int, mode: str) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                "UPDATE users SET privacy=? WHERE discord_user_id=?",
-                (mode, str(discord_user_id)),
-            )
-            await db.commit()
+        """Set the user's privacy, creating the user row if it does not exist yet."""
+
+        await self._write(
+            (
+                "INSERT INTO users(discord_user_id, privacy, created_at) VALUES(?, ?, ?) "
+                "ON CONFLICT(discord_user_id) DO UPDATE SET privacy=excluded.privacy"
+            ),
+            (discord_user_id, mode, int(time.time())),
+        )
 
     async def get_privacy(self, discord_user_id: int) -> str:
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._connection() as db:
             async with db.execute(
                 "SELECT privacy FROM users WHERE discord_user_id=?",
-                (str(discord_user_id),),
+                (discord_user_id,),
             ) as cursor:
                 row = await cursor.fetchone()
         return row[0] if row else "private"
 
     async def upsert_google_sub(self, discord_user_id: int, google_sub: str) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                (
-                    "INSERT INTO users(discord_user_id, google_sub, privacy, created_at) "
-                    "VALUES(?, ?, 'private', ?) "
-                    "ON CONFLICT(discord_user_id) DO UPDATE SET google_sub=excluded.google_sub"
-                ),
-                (str(discord_user_id), google_sub, int(time.time())),
-            )
-            await db.commit()
+        await self._write(
+            (
+                "INSERT INTO users(discord_user_id, google_sub, privacy, created_at) "
+                "VALUES(?, ?, 'private', ?) "
+                "ON CONFLICT(discord_user_id) DO UPDATE SET google_sub=excluded.google_sub"
+            ),
+            (discord_user_id, google_sub, int(time.time())),
+        )
 
     async def get_google_sub(self, discord_user_id: int) -> Optional[str]:
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._connection() as db:
             async with db.execute(
                 "SELECT google_sub FROM users WHERE discord_user_id=?",
-                (str(discord_user_id),),
+                (discord_user_id,),
             ) as cursor:
                 row = await cursor.fetchone()
         return row[0] if row and row[0] else None
 
     async def start_login_state(self, state: str, discord_user_id: int, ttl_sec: int = 900) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                (
-                    "INSERT OR REPLACE INTO login_states(state, discord_user_id, expires_at) "
-                    "VALUES(?, ?, ?)"
-                ),
-                (state, str(discord_user_id), int(time.time()) + ttl_sec),
-            )
-            await db.commit()
+        await self._write(
+            (
+                "INSERT OR REPLACE INTO login_states(state, discord_user_id, expires_at) "
+                "VALUES(?, ?, ?)"
+            ),
+            (state, discord_user_id, int(time.time()) + ttl_sec),
+        )
 
     async def consume_login_state(self, state: str) -> Optional[str]:
-        async with aiosqlite.connect(self._db_path) as db:
-            async with db.execute(
-                "SELECT discord_user_id, expires_at FROM login_states WHERE state=?",
-                (state,),
-            ) as cursor:
-                row = await cursor.fetchone()
-
-        if not row:
+        rows, _ = await self._write(
+            "DELETE FROM login_states WHERE state=? RETURNING discord_user_id, expires_at",
+            (state,),
+        )
+        if not rows:
             return None
 
-        discord_user_id, expires_at = row
+        discord_user_id, expires_at = rows[0]
         if int(time.time()) > int(expires_at):
-            async with aiosqlite.connect(self._db_path) as db:
-                await db.execute("DELETE FROM login_states WHERE state=?", (state,))
-                await db.commit()
             return None
-
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("DELETE FROM login_states WHERE state=?", (state,))
-            await db.commit()
         return str(discord_user_id)
 
     async def add_dataset(
         self, discord_user_id: int, name: str, source_url: Optional[str]
     ) -> int:
-        async with aiosqlite.connect(self._db_path) as db:
-            cursor = await db.execute(
-                (
-                    "INSERT INTO datasets(discord_user_id, name, source_url, created_at) "
-                    "VALUES(?, ?, ?, ?)"
-                ),
-                (str(discord_user_id), name, source_url, int(time.time())),
-            )
-            await db.commit()
-            assert cursor.lastrowid is not None
-            return int(cursor.lastrowid)
+        _, lastrowid = await self._write(
+            (
+                "INSERT INTO datasets(discord_user_id, name, source_url, created_at) "
+                "VALUES(?, ?, ?, ?)"
+            ),
+            (discord_user_id, name, source_url, int(time.time())),
+        )
+        assert lastrowid is not None
+        return int(lastrowid)
 
     async def list_datasets(
         self, discord_user_id: int, limit: int = 10
     ) -> Sequence[Tuple[int, str, Optional[str], int]]:
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._connection() as db:
             async with db.execute(
                 (
                     "SELECT id, name, source_url, created_at FROM datasets "
                     "WHERE discord_user_id=? ORDER BY id DESC LIMIT ?"
                 ),
-                (str(discord_user_id), limit),
+                (discord_user_id, limit),
             ) as cursor:
                 rows = await cursor.fetchall()
         return [(int(r[0]), str(r[1]), r[2], int(r[3])) for r in rows]
+
+    async def list_datasets_with_privacy(
+        self, discord_user_id: int, limit: int = 10
+    ) -> Tuple[Optional[str], Sequence[Tuple[int, str, Optional[str], int]]]:
+        """Return the user's privacy (``None`` if unknown) and recent datasets in one query."""
+
+        async with self._connection() as db:
+            async with db.execute(
+                (
+                    "SELECT u.privacy, d.id, d.name, d.source_url, d.created_at FROM users u "
+                    "LEFT JOIN datasets d ON d.discord_user_id=u.discord_user_id "
+                    "WHERE u.discord_user_id=? ORDER BY d.id DESC LIMIT ?"
+                ),
+                (discord_user_id, limit),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        if not rows:
+            return None, []
+        privacy = str(rows[0][0])
+        datasets = [
+            (int(r[1]), str(r[2]), r[3], int(r[4])) for r in rows if r[1] is not None
+        ]
+        return privacy, datasets
+
+    async def get_kv(self, key: str) -> Optional[str]:
+        """Return the stored value for ``key`` or ``None`` when absent."""
+
+        async with self._connection() as db:
+            async with db.execute("SELECT value FROM kv WHERE key=?", (key,)) as cursor:
+                row = await cursor.fetchone()
+        return str(row[0]) if row else None
+
+    async def set_kv(self, key: str, value: str) -> None:
+        await self._write(
+            (
+                "INSERT INTO kv(key, value) VALUES(?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+            ),
+            (key, value),
+        )
+
+    async def delete_kv(self, key: str) -> None:
+        await self._write("DELETE FROM kv WHERE key=?", (key,))
@@ -2,48 +2,93 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
-from typing import Tuple
+from typing import Union
 
-from PIL import Image
+from PIL import Image, ImageStat
 
 try:
     import pytesseract
 except ImportError:  # pragma: no cover - optional dependency
     pytesseract = None  # type: ignore
 
-import numpy as np
-
 logger = logging.getLogger(__name__)
 
-
-def classify_image(data: bytes) -> str:
+# Upper bound for images handed to these helpers; callers should compare it with
+# ``discord.Attachment.size`` before downloading anything.
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+
+# Colour statistics are stable well below this size; text needs more pixels.
+CLASSIFY_MAX_SIZE = (256, 256)
+OCR_MAX_SIZE = (1600, 1600)
+
+ImageData = Union[bytes, bytearray, memoryview]
+
+
+def _open_image(data: ImageData) -> Image.Image:
+    if memoryview(data).nbytes > MAX_IMAGE_BYTES:
+        raise ValueError("画像サイズが大きすぎます。8 MiB 以下の画像を指定してください。")
+    return Image.open(io.BytesIO(data))
+
+
+def _binarize(gray: Image.Image) -> Image.Image:
+    """Threshold a grayscale image at its Otsu level (computed from the C-level histogram)."""
+
+    histogram = gray.histogram()
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_level, best_variance = 0, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    lut = [0] * (best_level + 1) + [255] * (255 - best_level)
+    return gray.point(lut)
+
+
+def classify_image(data: ImageData) -> str:
     """Return a simple colour-based classification label for the image."""
 
-    with Image.open(io.BytesIO(data)) as img:
+    with _open_image(data) as img:
+        width, height = img.size
         image = img.convert("RGB")
-        array = np.array(image)
+    # Resize after converting: Pillow's reduce path rejects I/I;16 modes.
+    image.thumbnail(CLASSIFY_MAX_SIZE, Image.BILINEAR)
 
-    avg_color = array.mean(axis=(0, 1))
-    red, green, blue = avg_color
+    # Per-band means computed in a single C pass, without an ndarray copy.
+    red, green, blue = ImageStat.Stat(image).mean
     dominant = max((red, "赤系"), (green, "緑系"), (blue, "青系"), key=lambda item: item[0])[1]
-    brightness = float(array.mean())
+    brightness = (red + green + blue) / 3
     mood = "明るい" if brightness > 180 else "落ち着いた" if brightness > 100 else "暗め"
-    width, height = image.size
     aspect: float = width / height if height else 1
     orientation = "横長" if aspect > 1.2 else "縦長" if aspect < 0.8 else "ほぼ正方形"
     return f"推定カテゴリ: {dominant} / 雰囲気: {mood} / 形状: {orientation}"
 
 
-def ocr_image(data: bytes) -> str:
+def ocr_image(data: ImageData) -> str:
     """Extract text using pytesseract if available."""
 
     if pytesseract is None:
         raise RuntimeError("pytesseract がインストールされていません。")
 
-    with Image.open(io.BytesIO(data)) as img:
-        image = img.convert("RGB")
+    with _open_image(data) as img:
+        gray = img.convert("L")
+    # Only shrinks; smaller inputs are passed through untouched.
+    gray.thumbnail(OCR_MAX_SIZE, Image.LANCZOS)
+    # Tesseract works on binarised input anyway; one byte per pixel, clean contrast.
+    image = _binarize(gray)
 
     try:
         text = pytesseract.image_to_string(image, lang="jpn+eng")
@@ -56,3 +101,19 @@ def ocr_image(data: bytes) -> str:
     if not cleaned:
         return "テキストは検出されませんでした。"
     return cleaned
+
+
+async def classify_image_async(data: ImageData) -> str:
+    """Run :func:`classify_image` in a worker thread so the event loop stays responsive."""
+
+    return await asyncio.to_thread(classify_image, data)
+
+
+async def ocr_image_async(data: ImageData) -> str:
+    """Run :func:`ocr_image` in a worker thread so the event loop stays responsive.
+
+    pytesseract runs the ``tesseract`` binary in a subprocess, so concurrent calls
+    already use separate cores without a process pool.
+    """
+
+    return await asyncio.to_thread(ocr_image, data)
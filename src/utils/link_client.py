@@ -11,6 +11,9 @@ import aiohttp
 
 logger = logging.getLogger(__name__)
 
+_CODE_ALPHABET = string.ascii_uppercase + string.digits
+_RNG = secrets.SystemRandom()
+
 
 class LinkClient:
     """Generate link codes locally or via the ORA backend."""
@@ -51,5 +54,4 @@ class LinkClient:
 
     @staticmethod
     def _generate_dummy_code() -> str:
-        alphabet = string.ascii_uppercase + string.digits
-        return "".join(secrets.choice(alphabet) for _ in range(8))
+        return "".join(_RNG.choices(_CODE_ALPHABET, k=8))
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
@@ -14,6 +14,22 @@ class LLMClient:
         self._base_url = base_url.rstrip("/")
         self._api_key = api_key
         self._model = model
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
         url = f"{self._base_url}/chat/completions"
@@ -27,13 +43,11 @@ class LLMClient:
             "temperature": temperature,
             "stream": False,
         }
-        timeout = aiohttp.ClientTimeout(total=60)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, headers=headers, json=payload) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"LLM API error {resp.status}: {text}")
-                data = await resp.json()
+        async with self._get_session().post(url, headers=headers, json=payload) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"LLM API error {resp.status}: {text}")
+            data = await resp.json()
         try:
             return str(data["choices"][0]["message"]["content"])
         except (KeyError, IndexError, TypeError) as exc:
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from typing import List, Optional, Sequence, Tuple
 
 try:
@@ -15,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 SearchResult = Tuple[str, str]
 
+_CACHE_TTL = 300.0
+_CACHE_SIZE = 256
+
 
 class SearchClient:
     """Perform web searches using SerpApi when configured."""
@@ -22,6 +27,10 @@ class SearchClient:
     def __init__(self, api_key: Optional[str], engine: Optional[str]) -> None:
         self._api_key = api_key
         self._engine = engine or "google"
+        # (query, limit) -> (monotonic expiry, results), oldest first.
+        self._cache: OrderedDict[Tuple[str, int], Tuple[float, Tuple[SearchResult, ...]]] = (
+            OrderedDict()
+        )
 
     @property
     def enabled(self) -> bool:
@@ -30,6 +39,16 @@ class SearchClient:
     async def search(self, query: str, *, limit: int = 5) -> Sequence[SearchResult]:
         if not self.enabled:
             raise RuntimeError("検索APIが設定されていません。")
+
+        key = (query, limit)
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+            del self._cache[key]
+
         params = {
             "q": query,
             "api_key": self._api_key,
@@ -46,4 +65,8 @@ class SearchClient:
                 results.append((title, link))
             return results
 
-        return await asyncio.to_thread(_request)
+        results = tuple(await asyncio.to_thread(_request))
+        self._cache[key] = (now + _CACHE_TTL, results)
+        if len(self._cache) > _CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return results
@@ -1,62 +1,124 @@
-"""Speech-to-text client backed by OpenAI Whisper."""
+"""Speech-to-text client backed by faster-whisper (CTranslate2)."""
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 
 try:
-    import whisper
+    from faster_whisper import WhisperModel
 except ImportError:  # pragma: no cover - optional dependency
-    whisper = None  # type: ignore
+    WhisperModel = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# Loaded models shared by every WhisperClient, keyed by (model name, compute type).
+_MODEL_CACHE: Dict[Tuple[str, str], "WhisperModel"] = {}
+_MODEL_LOCK = asyncio.Lock()
+
+# Whisper models are trained on (and assume) 16 kHz mono input.
+WHISPER_SAMPLE_RATE = 16000
+
+
+def downsample_pcm(
+    pcm_data: Union[bytes, np.ndarray], sample_rate: int, channels: int
+) -> np.ndarray:
+    """Average interleaved s16le PCM down to 16 kHz mono int16.
+
+    ``sample_rate`` must be a multiple of 16 kHz; each output sample is the mean of
+    ``factor * channels`` input samples, computed in a single reduction.
+    """
+
+    factor, remainder = divmod(sample_rate, WHISPER_SAMPLE_RATE)
+    if factor == 0 or remainder:
+        raise ValueError(f"unsupported sample rate for downsampling: {sample_rate}")
+    samples = np.frombuffer(pcm_data, np.int16)
+    step = channels * factor
+    usable = samples.size - samples.size % step
+    mono = samples[:usable].reshape(-1, step).sum(axis=1, dtype=np.int32)
+    mono //= step
+    return mono.astype(np.int16)
+
+
+def pcm_to_whisper_audio(
+    pcm_data: Union[bytes, np.ndarray], sample_rate: int, channels: int
+) -> np.ndarray:
+    """Convert interleaved s16le PCM to peak-normalised 16 kHz mono float32.
+
+    ``pcm_data`` may be raw bytes or an int16 array viewing the same samples.
+
+    When ``sample_rate`` is a multiple of 16 kHz (Discord's 48 kHz is), the downmix and the
+    decimation are one integer reduction over ``factor * channels`` samples.
+    """
+
+    samples = np.frombuffer(pcm_data, np.int16)
+    factor, remainder = divmod(sample_rate, WHISPER_SAMPLE_RATE)
+    step = channels * (factor if factor and not remainder else 1)
+    usable = samples.size - samples.size % step
+    mono = samples[:usable].reshape(-1, step).sum(axis=1, dtype=np.int32)
+
+    peak = int(np.abs(mono).max(initial=0)) or 1
+    audio = mono.astype(np.float32)
+    audio *= 1.0 / peak
+
+    if audio.size and (factor == 0 or remainder):
+        target = int(audio.size * WHISPER_SAMPLE_RATE / sample_rate)
+        positions = np.linspace(0, audio.size - 1, num=target, dtype=np.float32)
+        audio = np.interp(positions, np.arange(audio.size), audio).astype(np.float32)
+    return audio
+
 
 class WhisperClient:
-    """Wrapper that transcribes PCM audio using Whisper."""
+    """Wrapper that transcribes PCM audio using an int8-quantised Whisper model on CPU."""
 
-    def __init__(self, model: str = "tiny", *, language: Optional[str] = "ja") -> None:
+    def __init__(
+        self,
+        model: str = "tiny",
+        *,
+        language: Optional[str] = "ja",
+        compute_type: str = "int8",
+    ) -> None:
         self._model_name = model
         self._language = language
-        self._model: Optional["whisper.Whisper"] = None
-        self._load_lock = asyncio.Lock()
+        self._compute_type = compute_type
+        self._model: Optional["WhisperModel"] = None
 
-    async def _ensure_model(self) -> "whisper.Whisper":
-        if whisper is None:
-            raise RuntimeError("openai-whisper がインストールされていません。")
+    async def _ensure_model(self) -> "WhisperModel":
+        if WhisperModel is None:
+            raise RuntimeError("faster-whisper がインストールされていません。")
         if self._model is not None:
             return self._model
-        async with self._load_lock:
-            if self._model is None:
-                logger.info("Loading Whisper model %s", self._model_name)
-                self._model = await asyncio.to_thread(whisper.load_model, self._model_name)
-        return self._model
+        key = (self._model_name, self._compute_type)
+        async with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                logger.info("Loading Whisper model %s (%s)", self._model_name, self._compute_type)
+                model = await asyncio.to_thread(
+                    WhisperModel, self._model_name, device="cpu", compute_type=self._compute_type
+                )
+                _MODEL_CACHE[key] = model
+        self._model = model
+        return model
 
     async def transcribe_pcm(
         self,
-        pcm_data: bytes,
+        pcm_data: Union[bytes, np.ndarray],
         *,
         sample_rate: int = 48000,
         channels: int = 2,
     ) -> str:
-        if not pcm_data:
+        if len(pcm_data) == 0:
             return ""
 
         model = await self._ensure_model()
 
-        audio = np.frombuffer(pcm_data, np.int16).astype(np.float32)
-        if channels > 1:
-            audio = audio.reshape(-1, channels).mean(axis=1)
-        audio = audio / np.max(np.abs(audio), initial=1.0)
+        audio = pcm_to_whisper_audio(pcm_data, sample_rate, channels)
 
         def _decode() -> str:
-            mel = whisper.log_mel_spectrogram(audio)
-            options = whisper.DecodingOptions(language=self._language, fp16=False)
-            result = whisper.decode(model, mel, options)
-            return result.text.strip()
+            segments, _ = model.transcribe(audio, language=self._language)
+            return "".join(segment.text for segment in segments).strip()
 
         return await asyncio.to_thread(_decode)
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# audio_query output is deterministic per (text, speaker); keep recent ones.
+_QUERY_CACHE_SIZE = 256
+
+# Synthesised WAVs for recently spoken phrases, bounded by count and total size.
+_AUDIO_CACHE_SIZE = 128
+_AUDIO_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
 
 class VoiceVoxClient:
     """Minimal VOICEVOX HTTP client that synthesises WAV audio from text."""
@@ -16,6 +26,27 @@ class VoiceVoxClient:
     def __init__(self, base_url: str, speaker_id: int) -> None:
         self._base_url = base_url.rstrip("/")
         self._speaker_id = speaker_id
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._query_cache: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+        self._audio_cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._audio_cache_bytes = 0
+        # One lock per phrase being synthesised so concurrent requests share the result.
+        self._synth_locks: Dict[bytes, asyncio.Lock] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def synthesize(self, text: str) -> bytes:
         """Synthesise ``text`` into WAV audio bytes."""
@@ -23,10 +54,49 @@ class VoiceVoxClient:
         if not text.strip():
             raise ValueError("読み上げ対象のテキストが空です。")
 
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        audio = self._cached_audio(key)
+        if audio is not None:
+            return audio
+
+        lock = self._synth_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                audio = self._cached_audio(key)
+                if audio is None:
+                    audio = await self._synthesize(text, key)
+                    self._cache_audio(key, audio)
+        finally:
+            if not lock.locked():
+                self._synth_locks.pop(key, None)
+        return audio
+
+    def _cached_audio(self, key: bytes) -> Optional[bytes]:
+        audio = self._audio_cache.get(key)
+        if audio is not None:
+            self._audio_cache.move_to_end(key)
+        return audio
+
+    def _cache_audio(self, key: bytes, audio: bytes) -> None:
+        if len(audio) > _AUDIO_CACHE_MAX_BYTES:
+            return
+        self._audio_cache[key] = audio
+        self._audio_cache_bytes += len(audio)
+        while (
+            len(self._audio_cache) > _AUDIO_CACHE_SIZE
+            or self._audio_cache_bytes > _AUDIO_CACHE_MAX_BYTES
+        ):
+            _, evicted = self._audio_cache.popitem(last=False)
+            self._audio_cache_bytes -= len(evicted)
+
+    async def _synthesize(self, text: str, key: bytes) -> bytes:
         params = {"speaker": self._speaker_id}
-        timeout = aiohttp.ClientTimeout(total=30)
+        session = self._get_session()
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        query = self._query_cache.get(key)
+        if query is not None:
+            self._query_cache.move_to_end(key)
+        else:
             query_url = f"{self._base_url}/audio_query"
             payload: Dict[str, Any] = {"text": text, "speaker": self._speaker_id}
             async with session.post(query_url, params=params, json=payload) as resp:
@@ -34,13 +104,16 @@ class VoiceVoxClient:
                     body = await resp.text()
                     raise RuntimeError(f"VOICEVOX audio_query 失敗: {resp.status} {body}")
                 query = await resp.json()
+            self._query_cache[key] = query
+            if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
 
-            synthesis_url = f"{self._base_url}/synthesis"
-            async with session.post(synthesis_url, params=params, json=query) as resp2:
-                if resp2.status != 200:
-                    body = await resp2.text()
-                    raise RuntimeError(f"VOICEVOX synthesis 失敗: {resp2.status} {body}")
-                audio = await resp2.read()
+        synthesis_url = f"{self._base_url}/synthesis"
+        async with session.post(synthesis_url, params=params, json=query) as resp2:
+            if resp2.status != 200:
+                body = await resp2.text()
+                raise RuntimeError(f"VOICEVOX synthesis 失敗: {resp2.status} {body}")
+            audio = await resp2.read()
 
         logger.debug("VOICEVOX synthesis completed (bytes=%d)", len(audio))
         return audio
@@ -3,83 +3,306 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import io
 import logging
-import os
-import tempfile
-from collections import defaultdict
-from typing import Awaitable, Callable, Dict, Optional
+import queue
+import re
+import threading
+import wave
+from collections import OrderedDict
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import discord
-from discord.ext import voice_recv
+import numpy as np
+from discord.ext import commands, voice_recv
 
-from .stt_client import WhisperClient
+try:
+    import webrtcvad
+except ImportError:  # pragma: no cover - optional dependency
+    webrtcvad = None  # type: ignore
+
+from .stt_client import WHISPER_SAMPLE_RATE, WhisperClient, downsample_pcm
 from .tts_client import VoiceVoxClient
 
 logger = logging.getLogger(__name__)
 
 HotwordCallback = Callable[[discord.Member, str], Awaitable[None]]
 
+# Discord voice receive delivers (and PCMAudio playback expects) 48kHz 16-bit stereo PCM.
+_RECV_SAMPLE_RATE = 48000
+_RECV_CHANNELS = 2
+
+# Voice activity gate applied before handing audio to Whisper. Frames are 32 ms of
+# the 16kHz mono downmix; a frame is voiced when it is louder than
+# _SPEECH_RMS_THRESHOLD and its normalised spectral entropy is below
+# _SPEECH_ENTROPY_MAX (broadband noise such as fans or hiss sits close to 1.0).
+# A buffer counts as speech when at least _MIN_SPEECH_RATIO of its frames are voiced.
+_FRAME_SAMPLES = 512
+_SPEECH_RMS_THRESHOLD = 500.0
+_SPEECH_ENTROPY_MAX = 0.85
+_MIN_SPEECH_RATIO = 0.1
+_FRAME_WINDOW = np.hanning(_FRAME_SAMPLES).astype(np.float32)
+
+# Optional WebRTC VAD confirmation: 10 ms frames, at least 200 ms voiced.
+_VAD_AGGRESSIVENESS = 2
+_VAD_FRAME_SAMPLES = WHISPER_SAMPLE_RATE // 100
+_VAD_MIN_VOICED_FRAMES = 20
+
+# Roughly 2 seconds of 48kHz 16-bit stereo audio (192000 bytes/sec).
+_BUFFER_SAMPLES = 192_000
+
+# Speakers whose partial windows are kept; the least recently heard is dropped
+# beyond this, and its buffer is recycled.
+_MAX_SPEAKERS = 16
+
+# Windows queued per member while a transcription is running; 14 x 2s stays
+# inside Whisper's 30 second context when they are sent as one request.
+_MAX_BACKLOG_WINDOWS = 14
+
+
+def _is_speech(pcm: Union[bytes, np.ndarray]) -> bool:
+    samples = np.frombuffer(pcm, np.int16)
+    usable = samples.size - samples.size % _FRAME_SAMPLES
+    if not usable:
+        return False
+    frames = samples[:usable].reshape(-1, _FRAME_SAMPLES)
+    needed = _MIN_SPEECH_RATIO * frames.shape[0]
+    # Energy straight from the int16 view; only loud frames are widened to float.
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.int64)
+    loud = frames[energy > (_SPEECH_RMS_THRESHOLD**2) * _FRAME_SAMPLES]
+    if loud.shape[0] < needed:
+        return False
+    # Spectral entropy only for the loud frames, in one batched FFT.
+    power = np.abs(np.fft.rfft(loud * _FRAME_WINDOW, axis=1)) ** 2
+    power /= power.sum(axis=1, keepdims=True) + 1e-12
+    entropy = -np.einsum("ij,ij->i", power, np.log2(power + 1e-12)) / np.log2(power.shape[1])
+    return bool(np.count_nonzero(entropy < _SPEECH_ENTROPY_MAX) >= needed)
+
+
+def _wav_to_pcm(audio: bytes) -> Optional[bytes]:
+    """Decode 16-bit PCM WAV (what VOICEVOX returns) to 48kHz stereo s16le in-process.
+
+    Returns ``None`` for anything else so the caller can fall back to FFmpeg.
+    """
+
+    try:
+        with wave.open(io.BytesIO(audio)) as wav:
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            if wav.getsampwidth() != 2 or channels not in (1, 2):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    samples = np.frombuffer(frames, "<i2").reshape(-1, channels)
+    count = samples.shape[0]
+    if rate != _RECV_SAMPLE_RATE and count:
+        positions = np.arange(round(count * _RECV_SAMPLE_RATE / rate)) * (rate / _RECV_SAMPLE_RATE)
+        source = np.arange(count)
+        samples = np.stack(
+            [np.rint(np.interp(positions, source, samples[:, ch])) for ch in range(channels)],
+            axis=1,
+        ).astype("<i2")
+    if channels == 1:
+        samples = np.repeat(samples, _RECV_CHANNELS, axis=1)
+    return samples.tobytes()
+
 
 class HotwordListener:
-    """Listens to PCM frames and detects the ORALLM hotword."""
+    """Listens to PCM frames and detects the ORALLM hotword.
+
+    ``feed`` runs on the voice receive thread and only buffers samples. Full windows go to a
+    worker thread for the speech check, which hands speech to the event loop for transcription.
+    """
+
+    _HOTWORD_RE = re.compile("orallm", re.IGNORECASE)
 
     def __init__(self, stt_client: WhisperClient) -> None:
         self._stt = stt_client
-        self._buffers: Dict[int, bytearray] = defaultdict(bytearray)
-        self._processing: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Preallocated int16 sample buffers and their fill positions, per member,
+        # least recently heard first. Only touched from the voice receive thread.
+        self._buffers: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._fill: Dict[int, int] = {}
+        # Buffers returned by the worker or by eviction, reused before allocating.
+        self._free_buffers: List[np.ndarray] = []
+        # Members with a window being transcribed, and the windows that arrived
+        # meanwhile; only touched on the event loop.
+        self._processing: Set[int] = set()
+        self._pending: Dict[int, List[np.ndarray]] = {}
         self._callback: Optional[HotwordCallback] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Only touched from the worker thread.
+        self._vad = webrtcvad.Vad(_VAD_AGGRESSIVENESS) if webrtcvad is not None else None
+        self._windows: queue.SimpleQueue[Optional[Tuple[discord.Member, np.ndarray]]] = (
+            queue.SimpleQueue()
+        )
+        self._worker = threading.Thread(target=self._run, name="hotword-vad", daemon=True)
+        self._worker.start()
 
     def set_callback(self, callback: HotwordCallback) -> None:
         self._callback = callback
 
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop that transcription coroutines are scheduled on."""
+
+        self._loop = loop
+
+    def close(self) -> None:
+        """Stop the worker thread once queued windows are handled."""
+
+        self._windows.put(None)
+
+    def _run(self) -> None:
+        while (item := self._windows.get()) is not None:
+            try:
+                self._handle_window(*item)
+            except Exception:
+                # Keep the worker alive; losing it would stop hotword detection for good.
+                logger.exception("ホットワード検出の音声処理に失敗しました")
+
+    def _handle_window(self, member: discord.Member, pcm: np.ndarray) -> None:
+        loop = self._loop
+        try:
+            if loop is None or loop.is_closed():
+                return
+            # One pass to 16kHz mono; both the gate and Whisper work on the 6x smaller buffer.
+            mono = downsample_pcm(pcm, _RECV_SAMPLE_RATE, _RECV_CHANNELS)
+        finally:
+            self._release_buffer(pcm)
+        # Silence and background noise never reach the (expensive) transcriber.
+        if not _is_speech(mono) or not self._vad_confirms(mono):
+            return
+        future = asyncio.run_coroutine_threadsafe(self._process(member, mono), loop)
+        future.add_done_callback(self._log_process_error)
+
+    @staticmethod
+    def _log_process_error(future: concurrent.futures.Future[None]) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.error("ホットワード処理に失敗しました", exc_info=exc)
+
+    def _vad_confirms(self, mono: np.ndarray) -> bool:
+        if self._vad is None:
+            return True
+        voiced = 0
+        for start in range(0, mono.size - _VAD_FRAME_SAMPLES + 1, _VAD_FRAME_SAMPLES):
+            frame = mono[start : start + _VAD_FRAME_SAMPLES].tobytes()
+            if self._vad.is_speech(frame, WHISPER_SAMPLE_RATE):
+                voiced += 1
+                if voiced >= _VAD_MIN_VOICED_FRAMES:
+                    return True
+        return False
+
+    def _take_buffer(self) -> np.ndarray:
+        try:
+            return self._free_buffers.pop()
+        except IndexError:
+            return np.empty(_BUFFER_SAMPLES, np.int16)
+
+    def _release_buffer(self, buffer: np.ndarray) -> None:
+        if len(self._free_buffers) < _MAX_SPEAKERS:
+            self._free_buffers.append(buffer)
+
     def feed(self, member: Optional[discord.Member], pcm: bytes) -> None:
         if member is None or not pcm:
             return
-        buffer = self._buffers[member.id]
-        buffer.extend(pcm)
-        # Process roughly every ~2 seconds of audio (assuming 48kHz 16-bit stereo -> 192000 bytes/sec)
-        if len(buffer) >= 384000:
-            data = bytes(buffer)
-            self._buffers[member.id].clear()
-            asyncio.create_task(self._process(member, data))
-
-    async def _process(self, member: discord.Member, pcm: bytes) -> None:
-        lock = self._processing[member.id]
-        if lock.locked():
+        samples = np.frombuffer(pcm, np.int16)
+        buffer = self._buffers.get(member.id)
+        if buffer is None:
+            buffer = self._buffers[member.id] = self._take_buffer()
+            if len(self._buffers) > _MAX_SPEAKERS:
+                evicted_id, evicted = self._buffers.popitem(last=False)
+                self._fill.pop(evicted_id, None)
+                self._release_buffer(evicted)
+        else:
+            self._buffers.move_to_end(member.id)
+        pos = self._fill.get(member.id, 0)
+        while samples.size:
+            count = min(samples.size, _BUFFER_SAMPLES - pos)
+            buffer[pos : pos + count] = samples[:count]
+            samples = samples[count:]
+            pos += count
+            if pos == _BUFFER_SAMPLES:
+                # Hand the full buffer off as-is and start a fresh one instead of copying.
+                self._windows.put((member, buffer))
+                buffer = self._buffers[member.id] = self._take_buffer()
+                pos = 0
+        self._fill[member.id] = pos
+
+    async def _process(self, member: discord.Member, pcm: np.ndarray) -> None:
+        if member.id in self._processing:
+            backlog = self._pending.setdefault(member.id, [])
+            backlog.append(pcm)
+            if len(backlog) > _MAX_BACKLOG_WINDOWS:
+                del backlog[0]
+            return
+        self._processing.add(member.id)
+        try:
+            while True:
+                await self._transcribe(member, pcm)
+                # Everything that queued up meanwhile goes out as a single request.
+                backlog = self._pending.pop(member.id, None)
+                if not backlog:
+                    return
+                pcm = backlog[0] if len(backlog) == 1 else np.concatenate(backlog)
+        finally:
+            self._processing.discard(member.id)
+
+    async def _transcribe(self, member: discord.Member, pcm: np.ndarray) -> None:
+        try:
+            transcript = await self._stt.transcribe_pcm(
+                pcm, sample_rate=WHISPER_SAMPLE_RATE, channels=1
+            )
+        except Exception:
+            logger.exception("音声認識に失敗しました")
             return
-        async with lock:
-            try:
-                transcript = await self._stt.transcribe_pcm(pcm)
-            except Exception:
-                logger.exception("音声認識に失敗しました")
-                return
 
-            if not transcript:
-                return
+        if not transcript:
+            return
 
-            lower = transcript.lower()
-            key = "orallm"
-            if key not in lower:
-                return
+        match = self._HOTWORD_RE.search(transcript)
+        if match is None:
+            return
 
-            index = lower.index(key)
-            command = transcript[index + len(key) :].strip()
-            if not command:
-                return
+        command = transcript[match.end() :].strip()
+        if not command:
+            return
 
-            if self._callback:
+        if self._callback:
+            try:
                 await self._callback(member, command)
+            except Exception:
+                logger.exception("ホットワードのコールバックに失敗しました")
 
 
 class VoiceManager:
-    """Manages Discord voice clients for playback and recording."""
+    """Manages Discord voice clients for playback and recording.
+
+    Resolving speakers and keeping ``_members`` fresh requires the client to run
+    with the ``voice_states`` and ``members`` intents and a member cache that keeps
+    voice members (e.g. ``MemberCacheFlags.voice``); ``ORABot`` enables neither yet.
+    """
 
     def __init__(self, bot: discord.Client, tts: VoiceVoxClient, stt: WhisperClient) -> None:
         self._bot = bot
         self._tts = tts
         self._stt = stt
-        self._play_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Created on the event loop in _play_audio, never from voice receive callbacks.
+        self._play_locks: Dict[int, asyncio.Lock] = {}
         self._listener = HotwordListener(stt)
+        # (guild_id, user_id) -> Member resolved on the voice-receive hot path.
+        self._members: Dict[Tuple[int, int], discord.Member] = {}
+        self._sinks: Dict[int, voice_recv.BasicSink] = {}
+        if isinstance(bot, commands.Bot):
+            bot.add_listener(self._on_voice_state_update, "on_voice_state_update")
+            bot.add_listener(self._on_member_remove, "on_member_remove")
+            bot.add_listener(self._on_member_update, "on_member_update")
+            bot.add_listener(self._on_ready, "on_ready")
 
     def set_hotword_callback(self, callback: HotwordCallback) -> None:
         self._listener.set_callback(callback)
@@ -91,19 +314,27 @@ class VoiceManager:
         channel = member.voice.channel
         guild = member.guild
         voice_client = guild.voice_client
+        self._listener.bind_loop(asyncio.get_running_loop())
 
         if voice_client and voice_client.channel != channel:
             await voice_client.move_to(channel)
         elif not voice_client:
             voice_client = await channel.connect(cls=voice_recv.VoiceRecvClient)
-            sink = voice_recv.BasicSink(lambda user, data: self._on_voice_frame(guild, user, data))
-            voice_client.listen(sink)
+            voice_client.listen(self._sink_for(guild))
         elif isinstance(voice_client, voice_recv.VoiceRecvClient) and not voice_client.is_listening():
-            sink = voice_recv.BasicSink(lambda user, data: self._on_voice_frame(guild, user, data))
-            voice_client.listen(sink)
+            voice_client.listen(self._sink_for(guild))
 
         return voice_client
 
+    def _sink_for(self, guild: discord.Guild) -> voice_recv.BasicSink:
+        sink = self._sinks.get(guild.id)
+        if sink is None:
+            # Bound to the id, not the Guild: a new gateway session replaces every Guild.
+            sink = self._sinks[guild.id] = voice_recv.BasicSink(
+                partial(self._on_voice_frame, guild.id)
+            )
+        return sink
+
     async def play_tts(self, member: discord.Member, text: str) -> bool:
         voice_client = await self.ensure_voice_client(member)
         if voice_client is None:
@@ -120,39 +351,70 @@ class VoiceManager:
 
     async def _play_audio(self, voice_client: discord.VoiceClient, audio: bytes) -> None:
         guild_id = voice_client.guild.id
-        lock = self._play_locks[guild_id]
+        lock = self._play_locks.get(guild_id)
+        if lock is None:
+            lock = self._play_locks[guild_id] = asyncio.Lock()
+        # Plain PCM WAV is converted in-process, avoiding an FFmpeg spawn per utterance.
+        pcm = await asyncio.to_thread(_wav_to_pcm, audio)
         async with lock:
-            with tempfile.NamedTemporaryFile("wb", delete=False, suffix=".wav") as tmp:
-                tmp.write(audio)
-                path = tmp.name
-            try:
-                source = discord.FFmpegPCMAudio(path)
-                voice_client.play(source)
-                while voice_client.is_playing():
-                    await asyncio.sleep(0.25)
-            finally:
-                try:
-                    os.remove(path)
-                except OSError:
-                    logger.warning("一時ファイル %s の削除に失敗しました", path)
+            source: discord.AudioSource
+            if pcm is not None:
+                source = discord.PCMAudio(io.BytesIO(pcm))
+            else:
+                # FFmpeg reads the WAV from stdin, so nothing touches the disk.
+                source = discord.FFmpegPCMAudio(io.BytesIO(audio), pipe=True)
+            loop = asyncio.get_running_loop()
+            finished = asyncio.Event()
+
+            def _after(error: Optional[Exception]) -> None:
+                # Runs on discord.py's audio player thread.
+                if error is not None:
+                    logger.error("音声の再生に失敗しました: %s", error)
+                loop.call_soon_threadsafe(finished.set)
+
+            voice_client.play(source, after=_after)
+            await finished.wait()
+
+    async def _on_ready(self) -> None:
+        # A new gateway session rebuilds the member cache; cached Members are stale.
+        self._members.clear()
+
+    async def _on_voice_state_update(
+        self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
+    ) -> None:
+        if after.channel is None:
+            self._members.pop((member.guild.id, member.id), None)
+
+    async def _on_member_remove(self, member: discord.Member) -> None:
+        self._members.pop((member.guild.id, member.id), None)
+
+    async def _on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        # Keep cached entries current (nick/roles) for the hotword callback.
+        key = (after.guild.id, after.id)
+        if key in self._members:
+            self._members[key] = after
 
     def _on_voice_frame(
         self,
-        guild: discord.Guild,
+        guild_id: int,
         user: Optional[discord.User],
         data: voice_recv.VoiceData,
     ) -> None:
-        if not isinstance(user, discord.Member):
-            # Attempt to resolve user -> member
-            if user is not None:
-                member = guild.get_member(user.id)
-            else:
-                member = None
-        else:
-            member = user
-
-        if member is None:
+        # Bots (including this one) never say the hotword; drop them before any lookup.
+        if user is None or user.bot:
             return
+        key = (guild_id, user.id)
+        member = self._members.get(key)
+        if member is None:
+            # Attempt to resolve user -> member once, then reuse it for later frames
+            if isinstance(user, discord.Member):
+                member = user
+            else:
+                guild = self._bot.get_guild(guild_id)
+                member = guild.get_member(user.id) if guild is not None else None
+            if member is None:
+                return
+            self._members[key] = member
 
         pcm = data.pcm or b""
         if not pcm: